@@ -2,18 +2,94 @@ from fastapi import APIRouter, Request, Query
 from fastapi.responses import RedirectResponse, JSONResponse
 from google.oauth2 import id_token
 from google.auth.transport import requests
-from urllib.parse import urlparse, parse_qs, urlencode, urlunparse
+from urllib.parse import urlsplit
+import requests as requests_lib
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor
 import jwt
-import base64
-import json
+import time
+import logging
 
 from app.auth.google_oauth import create_oauth_flow, get_authorization_url
-from app.auth.sessions import create_session_token
+from app.auth.sessions import create_session_token, create_oauth_state, decode_oauth_state
 from app.config import settings
-from app.db.firestore import db
+from app.db.firestore import get_db, invalidate_user_google_tokens
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+_LOCAL_HOSTS = frozenset({"localhost", "127.0.0.1"})
+
+# Headers checked for the frontend URL, in priority order
+_FRONTEND_HEADERS = ("referer", "origin")
+
+# Runs the Firestore user upsert alongside session token signing in the callback
+_BACKGROUND_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="auth-bg")
+
+_GOOGLE_CERTS_URL = "https://www.googleapis.com/oauth2/v1/certs"
+_GOOGLE_CERTS_TTL = 3600
+
+
+class _CertsCachingRequest(requests.Request):
+    """
+    Transport for ID token verification.
+    Reuses one HTTP session and caches Google's signing certs, so a callback
+    only pays for the RSA check instead of a certs fetch.
+    """
+
+    def __init__(self):
+        session = requests_lib.Session()
+        # Keep TLS connections to googleapis warm across callbacks
+        session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16, pool_block=False))
+        super().__init__(session=session)
+        self._certs_response = None
+        self._certs_fetched_at = 0.0
+
+    def __call__(self, url, method="GET", **kwargs):
+        if method != "GET" or url != _GOOGLE_CERTS_URL:
+            return super().__call__(url, method=method, **kwargs)
+
+        if self._certs_response is None or time.monotonic() - self._certs_fetched_at > _GOOGLE_CERTS_TTL:
+            response = super().__call__(url, method=method, **kwargs)
+            if response.status != 200:
+                return response
+            self._certs_response = response
+            self._certs_fetched_at = time.monotonic()
+        return self._certs_response
+
+
+_GOOGLE_REQUEST = _CertsCachingRequest()
+
+# Redirect prefixes for the allowed frontends, built once at startup
+_REDIRECT_PREFIXES = {url: f"{url}/?token=" for url in settings.ALLOWED_FRONTENDS}
+if not _REDIRECT_PREFIXES:
+    logger.warning("ALLOWED_FRONTENDS is empty; only local dev frontends can be used as login redirects")
+
+
+def _is_local_frontend(hostname) -> bool:
+    return hostname in _LOCAL_HOSTS or bool(hostname and hostname.startswith("192.168."))
+
+
+def _get_redirect_prefix(frontend_url: str):
+    """
+    Redirect prefix for an allowed frontend, or None if it isn't allowed.
+    Besides ALLOWED_FRONTENDS, the local dev frontend that google_login infers
+    (port 3000 on a local or LAN host) is accepted.
+    """
+    prefix = _REDIRECT_PREFIXES.get(frontend_url)
+    if prefix is not None:
+        return prefix
+    try:
+        parsed = urlsplit(frontend_url)
+        port = parsed.port
+    except ValueError:
+        return None
+    if (parsed.scheme in ("http", "https") and port == 3000 and _is_local_frontend(parsed.hostname)
+            and not (parsed.path or parsed.query or parsed.fragment)):
+        return f"{frontend_url}/?token="
+    return None
+
 @router.get("/auth/google/login")
 def google_login(request: Request, frontend_url: str = Query(None)):
     """
@@ -27,53 +103,37 @@ def google_login(request: Request, frontend_url: str = Query(None)):
     # Priority: 1) Query parameter, 2) Referer header, 3) Origin header, 4) Infer from request
     if frontend_url:
         target_frontend = frontend_url
-        print(f"[AUTH] Using frontend_url from query parameter: {target_frontend}")
+        logger.debug("Using frontend_url from query parameter: %s", target_frontend)
     else:
-        # Try Referer header first (most reliable)
-        referer = request.headers.get("referer")
-        if referer and referer.strip():
+        # Try Referer header first (most reliable), then Origin as fallback
+        headers = request.headers
+        for header_name in _FRONTEND_HEADERS:
+            header_value = headers.get(header_name)
+            if not header_value or not header_value.strip():
+                continue
             try:
-                parsed = urlparse(referer)
-                if parsed.scheme and parsed.netloc:
-                    target_frontend = f"{parsed.scheme}://{parsed.netloc}"
-                    print(f"[AUTH] Using frontend URL from Referer header: {target_frontend}")
-                else:
-                    raise ValueError("Invalid referer URL")
-            except Exception as e:
-                print(f"[AUTH] Error parsing referer: {e}")
-                referer = None
-        
-        # Try Origin header as fallback
-        if not referer or not referer.strip():
-            origin = request.headers.get("origin")
-            if origin and origin.strip():
-                try:
-                    parsed = urlparse(origin)
-                    if parsed.scheme and parsed.netloc:
-                        target_frontend = f"{parsed.scheme}://{parsed.netloc}"
-                        print(f"[AUTH] Using frontend URL from Origin header: {target_frontend}")
-                    else:
-                        raise ValueError("Invalid origin URL")
-                except Exception as e:
-                    print(f"[AUTH] Error parsing origin: {e}")
-                    origin = None
-        
-        # If neither Referer nor Origin available, try to infer from request
-        if (not referer or not referer.strip()) and (not origin or not origin.strip()):
-            # For local development: try to infer from the request URL
+                parsed = urlsplit(header_value)
+            except ValueError as e:
+                logger.warning("Error parsing %s: %s", header_name, e)
+                continue
+            if parsed.scheme and parsed.netloc:
+                target_frontend = f"{parsed.scheme}://{parsed.netloc}"
+                logger.debug("Using frontend URL from %s header: %s", header_name, target_frontend)
+                break
+            logger.warning("Error parsing %s: invalid URL %s", header_name, header_value)
+        else:
+            # If neither Referer nor Origin available, try to infer from request
+            # (for local development)
             try:
-                base_url = str(request.base_url).rstrip('/')
-                parsed = urlparse(base_url)
+                # Starlette already parsed base_url, so read its components directly
+                base_url = request.base_url
+                hostname = base_url.hostname
                 
                 # Check if we're running locally
-                if parsed.hostname in ['localhost', '127.0.0.1'] or (parsed.hostname and parsed.hostname.startswith('192.168.')):
-                    # For local development, assume frontend is on port 3000
-                    if ':8080' in base_url:
-                        target_frontend = base_url.replace(':8080', ':3000')
-                    else:
-                        # If backend is not on 8080, use same host with port 3000
-                        target_frontend = f"{parsed.scheme}://{parsed.hostname}:3000"
-                    print(f"[AUTH] No Referer/Origin header, inferred local frontend URL: {target_frontend}")
+                if _is_local_frontend(hostname):
+                    # For local development, assume frontend is on port 3000 of the same host
+                    target_frontend = f"{base_url.scheme}://{hostname}:3000"
+                    logger.debug("No Referer/Origin header, inferred local frontend URL: %s", target_frontend)
                 else:
                     # For non-local, we can't guess - require explicit parameter
                     raise ValueError(
@@ -89,36 +149,17 @@ def google_login(request: Request, frontend_url: str = Query(None)):
                     "Please pass frontend_url query parameter: /auth/google/login?frontend_url=YOUR_URL"
                 )
     
-    flow = create_oauth_flow()
-    auth_url, oauth_state = get_authorization_url(flow)
-    
-    # Store frontend URL in OAuth state (combine with Google's state)
-    # Google's state is for CSRF protection, we'll append our data
-    state_data = {
-        "frontend_url": target_frontend,
-        "oauth_state": oauth_state  # Preserve Google's state
-    }
-    state_encoded = base64.urlsafe_b64encode(
-        json.dumps(state_data).encode()
-    ).decode()
-    
-    # Replace the state parameter in the auth URL with our combined state
-    parsed = urlparse(auth_url)
-    query_params = parse_qs(parsed.query, keep_blank_values=True)
-    query_params['state'] = [state_encoded]  # Replace state with our combined state
+    target_frontend = target_frontend.rstrip("/")
+    if _get_redirect_prefix(target_frontend) is None:
+        raise ValueError(
+            f"Frontend URL {target_frontend} is not allowed. "
+            "Add it to ALLOWED_FRONTENDS to use it as a login redirect."
+        )
     
-    # Reconstruct URL
-    new_query = urlencode(query_params, doseq=True)
-    auth_url = urlunparse((
-        parsed.scheme,
-        parsed.netloc,
-        parsed.path,
-        parsed.params,
-        new_query,
-        parsed.fragment
-    ))
+    # Carry the frontend URL in a short-lived signed state and hand it to Google as-is
+    auth_url, _ = get_authorization_url(state=create_oauth_state(target_frontend))
     
-    print(f"[AUTH] Login initiated, will redirect to: {target_frontend}")
+    logger.debug("Login initiated, will redirect to: %s", target_frontend)
     
     return RedirectResponse(auth_url)
 
@@ -140,10 +181,7 @@ def google_callback(code: str, state: str = Query(None)):
         )
     
     try:
-        state_data = json.loads(
-            base64.urlsafe_b64decode(state.encode()).decode()
-        )
-        frontend_url = state_data.get("frontend_url")
+        frontend_url = decode_oauth_state(state)
         
         if not frontend_url:
             raise ValueError(
@@ -152,7 +190,13 @@ def google_callback(code: str, state: str = Query(None)):
                 "Please try logging in again from your frontend application."
             )
         
-        print(f"[AUTH] Callback received, will redirect to: {frontend_url}")
+        if _get_redirect_prefix(frontend_url) is None:
+            raise ValueError(
+                f"Frontend URL {frontend_url} is not allowed. "
+                "Add it to ALLOWED_FRONTENDS to use it as a login redirect."
+            )
+        
+        logger.debug("Callback received, will redirect to: %s", frontend_url)
     except ValueError:
         raise  # Re-raise ValueError
     except Exception as e:
@@ -177,9 +221,8 @@ def google_callback(code: str, state: str = Query(None)):
     # (verify_oauth2_token would verify it, but we can also just decode for development)
     try:
         # Try to verify with Google's public keys
-        request = requests.Request()
         info = id_token.verify_oauth2_token(
-            id_token_jwt, request, settings.GOOGLE_CLIENT_ID
+            id_token_jwt, _GOOGLE_REQUEST, settings.GOOGLE_CLIENT_ID
         )
     except:
         # Fallback: decode without verification for testing
@@ -187,17 +230,24 @@ def google_callback(code: str, state: str = Query(None)):
 
     user_id = info["sub"]
 
-    db.document(f"users/{user_id}").set({
-        "email": info["email"],
-        "google_tokens": {
-            "access_token": credentials.token,
-            "refresh_token": credentials.refresh_token,
-        }
-    }, merge=True)
+    # Start the user upsert in the background and sign the session token meanwhile
+    user_write = _BACKGROUND_EXECUTOR.submit(
+        get_db().document(f"users/{user_id}").set,
+        {
+            "email": info["email"],
+            "google_tokens": {
+                "access_token": credentials.token,
+                "refresh_token": credentials.refresh_token,
+            }
+        },
+        merge=True,
+    )
 
     session_token = create_session_token(user_id)
     
+    # Make sure the tokens are stored before the frontend can use the session
+    user_write.result()
+    invalidate_user_google_tokens(user_id)
+    
     # Redirect to frontend with token (use the frontend URL from state)
-    return RedirectResponse(
-        f"{frontend_url}/?token={session_token}"
-    )
+    return RedirectResponse(_get_redirect_prefix(frontend_url) + session_token)
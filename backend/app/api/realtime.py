@@ -1,8 +1,9 @@
 """
 WebSocket endpoint for OpenAI Realtime API integration
 """
-import json
 import asyncio
+import logging
+from functools import lru_cache
 from typing import Optional
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 from openai import OpenAI
@@ -10,8 +11,15 @@ from app.config import settings
 from app.auth.middleware import get_user_id_from_token
 from app.llm.realtime_handler import RealtimeHandler
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
+@lru_cache(maxsize=1)
+def get_openai_client() -> OpenAI:
+    """Shared OpenAI client, so connections reuse its HTTP connection pool"""
+    return OpenAI(api_key=settings.OPENAI_API_KEY)
+
 @router.websocket("/realtime")
 async def websocket_endpoint(websocket: WebSocket):
     """
@@ -19,9 +27,9 @@ async def websocket_endpoint(websocket: WebSocket):
     Handles audio streaming and tool calls.
     """
     try:
-        print(f"[REALTIME] New connection attempt from {websocket.client}")
+        logger.debug("New connection attempt from %s", websocket.client)
         await websocket.accept()
-        print(f"[REALTIME] WebSocket accepted")
+        logger.debug("WebSocket accepted")
         
         # Get user_id from query params or headers
         user_id = None
@@ -32,35 +40,33 @@ async def websocket_endpoint(websocket: WebSocket):
             # Try to get from headers
             auth_header = websocket.headers.get("authorization", "")
             if auth_header.startswith("Bearer "):
-                token = auth_header.replace("Bearer ", "")
+                token = auth_header[7:]
         
-        print(f"[REALTIME] Token received: {bool(token)}, timezone: {timezone_offset}")
+        logger.debug("Token received: %s, timezone: %s", bool(token), timezone_offset)
         
         if token:
             try:
                 user_id = get_user_id_from_token(token)
-                print(f"[REALTIME] User authenticated: {user_id}")
+                logger.debug("User authenticated: %s", user_id)
             except Exception as e:
-                print(f"[REALTIME] Auth error: {e}")
-                import traceback
-                traceback.print_exc()
+                logger.warning("Auth error: %s", e)
                 await websocket.close(code=1008, reason="Authentication failed")
                 return
         
         if not user_id:
-            print(f"[REALTIME] No user_id found")
+            logger.debug("No user_id found")
             await websocket.close(code=1008, reason="User ID required")
             return
         
-        print(f"[REALTIME] Connection established for user {user_id} with timezone {timezone_offset}")
+        logger.info("Connection established for user %s with timezone %s", user_id, timezone_offset)
         
         # Initialize OpenAI client
         if not settings.OPENAI_API_KEY:
-            print(f"[REALTIME] ERROR: OPENAI_API_KEY not set")
+            logger.error("OPENAI_API_KEY not set")
             await websocket.close(code=1011, reason="Server configuration error")
             return
             
-        client = OpenAI(api_key=settings.OPENAI_API_KEY)
+        client = get_openai_client()
         
         # Initialize handler with timezone
         handler = RealtimeHandler(user_id=user_id, websocket=websocket, client=client, user_timezone=timezone_offset)
@@ -69,11 +75,9 @@ async def websocket_endpoint(websocket: WebSocket):
         await handler.handle_connection()
         
     except WebSocketDisconnect:
-        print(f"[REALTIME] Client disconnected")
+        logger.debug("Client disconnected")
     except Exception as e:
-        print(f"[REALTIME] Error: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error: %s", e)
         try:
             await websocket.close(code=1011, reason=f"Server error: {str(e)}")
         except:
@@ -1,4 +1,8 @@
+import re
+from functools import lru_cache
+from urllib.parse import quote
 from google_auth_oauthlib.flow import Flow
+from oauthlib.common import generate_token
 from app.config import settings
 
 SCOPES = [
@@ -7,27 +11,54 @@ SCOPES = [
     "https://www.googleapis.com/auth/calendar.events"
 ]
 
+# Matches the state parameter in an authorization URL query
+_STATE_PARAM_RE = re.compile(r'&?state=[^&]*')
+
+@lru_cache(maxsize=1)
+def _get_client_config() -> dict:
+    """Client config is static, so build it once"""
+    return {
+        "web": {
+            "client_id": settings.GOOGLE_CLIENT_ID,
+            "client_secret": settings.GOOGLE_CLIENT_SECRET,
+            "auth_uri": "https://accounts.google.com/o/oauth2/auth",
+            "token_uri": "https://oauth2.googleapis.com/token",
+            "redirect_uris": [settings.GOOGLE_REDIRECT_URI],
+        }
+    }
+
 def create_oauth_flow():
     flow = Flow.from_client_config(
-        {
-            "web": {
-                "client_id": settings.GOOGLE_CLIENT_ID,
-                "client_secret": settings.GOOGLE_CLIENT_SECRET,
-                "auth_uri": "https://accounts.google.com/o/oauth2/auth",
-                "token_uri": "https://oauth2.googleapis.com/token",
-                "redirect_uris": [settings.GOOGLE_REDIRECT_URI],
-            }
-        },
+        _get_client_config(),
         scopes=SCOPES,
         redirect_uri=settings.GOOGLE_REDIRECT_URI,
+        # The callback runs on a fresh Flow, so a per-login PKCE verifier could never be
+        # sent back; the client secret authenticates the code exchange instead
+        autogenerate_code_verifier=False,
     )
     return flow
 
-def get_authorization_url(flow):
-    """Generate authorization URL with proper parameters for ID token"""
-    auth_url, state = flow.authorization_url(
+@lru_cache(maxsize=1)
+def _get_authorization_url_template() -> str:
+    """
+    Authorization URL without the state parameter.
+    With no PKCE challenge, everything except state is fixed, so the Flow is only needed once.
+    """
+    auth_url, _ = create_oauth_flow().authorization_url(
         prompt="consent",
         access_type="offline",
         include_granted_scopes="true"
     )
+    base, _, query = auth_url.partition("?")
+    query = _STATE_PARAM_RE.sub("", query).lstrip("&")
+    return f"{base}?{query}"
+
+def get_authorization_url(state: str = None):
+    """
+    Generate authorization URL with proper parameters for ID token.
+    Uses the given state as-is, or a random one if not provided.
+    """
+    if state is None:
+        state = generate_token()
+    auth_url = f"{_get_authorization_url_template()}&state={quote(state)}"
     return auth_url, state
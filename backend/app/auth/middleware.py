@@ -1,14 +1,36 @@
+import time
+import hashlib
 from fastapi import Request, HTTPException
-from app.auth.sessions import verify_session_token
+from app.auth.sessions import decode_session_token
+
+# Verified tokens -> (user_id, expires_at), so repeat requests skip the HMAC check
+# Keyed on a short digest to avoid holding full token strings
+_TOKEN_CACHE_MAXSIZE = 10000
+_TOKEN_CACHE_TTL = 300
+_token_cache = {}
+
+def _verify_token_cached(token: str) -> str:
+    key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+    now = time.time()
+    entry = _token_cache.get(key)
+    if entry is not None and entry[1] > now:
+        return entry[0]
+
+    payload = decode_session_token(token)
+    if len(_token_cache) >= _TOKEN_CACHE_MAXSIZE:
+        # Evict the oldest entry (dicts keep insertion order)
+        _token_cache.pop(next(iter(_token_cache)), None)
+    _token_cache[key] = (payload["sub"], min(payload["exp"], now + _TOKEN_CACHE_TTL))
+    return payload["sub"]
 
 async def require_auth(request: Request):
     auth = request.headers.get("Authorization")
     if not auth or not auth.startswith("Bearer "):
         raise HTTPException(status_code=401, detail="Not authenticated")
 
-    token = auth.split(" ")[1]
+    token = auth[7:]
     try:
-        user_id = verify_session_token(token)
+        user_id = _verify_token_cached(token)
     except Exception:
         raise HTTPException(status_code=401, detail="Invalid token")
 
@@ -16,4 +38,4 @@ async def require_auth(request: Request):
 
 def get_user_id_from_token(token: str) -> str:
     """Extract user_id from token for WebSocket connections"""
-    return verify_session_token(token)
+    return _verify_token_cached(token)
@@ -1,16 +1,48 @@
 import jwt
-import uuid
-from datetime import datetime, timedelta
+import time
+import secrets
+from jwt.algorithms import HMACAlgorithm
+from oauthlib.common import generate_token
 from app.config import settings
 
+# Decoder with required claims bound once instead of merged per call
+_decoder = jwt.PyJWT(options={"require": ["exp", "sub"], "verify_aud": False})
+_state_decoder = jwt.PyJWT(options={"require": ["exp", "fu"], "verify_aud": False})
+
+# Encoder and HMAC key prepared once instead of on every token issued
+_encoder = jwt.PyJWT()
+_signing_key = HMACAlgorithm(HMACAlgorithm.SHA256).prepare_key(settings.JWT_SECRET)
+
+SESSION_TTL_SECONDS = 24 * 60 * 60
+OAUTH_STATE_TTL_SECONDS = 600
+
 def create_session_token(user_id: str) -> str:
     payload = {
         "sub": user_id,
-        "exp": datetime.utcnow() + timedelta(hours=24),
-        "jti": str(uuid.uuid4()),
+        "exp": int(time.time()) + SESSION_TTL_SECONDS,
+        "jti": secrets.token_urlsafe(16),
     }
-    return jwt.encode(payload, settings.JWT_SECRET, algorithm=settings.JWT_ALGO)
+    return _encoder.encode(payload, _signing_key, algorithm=settings.JWT_ALGO)
+
+def decode_session_token(token: str) -> dict:
+    return _decoder.decode(token, settings.JWT_SECRET, algorithms=[settings.JWT_ALGO])
 
 def verify_session_token(token: str) -> str:
-    payload = jwt.decode(token, settings.JWT_SECRET, algorithms=[settings.JWT_ALGO])
-    return payload["sub"]
+    return decode_session_token(token)["sub"]
+
+def create_oauth_state(frontend_url: str) -> str:
+    """
+    Build the OAuth state parameter as a signed JWT.
+    fu is the frontend URL to return to, os is a random nonce so each state is unique.
+    """
+    payload = {
+        "fu": frontend_url,
+        "os": generate_token(),
+        "exp": int(time.time()) + OAUTH_STATE_TTL_SECONDS,
+    }
+    return _encoder.encode(payload, _signing_key, algorithm=settings.JWT_ALGO)
+
+def decode_oauth_state(state: str) -> str:
+    """Verify the OAuth state and return the frontend URL it carries"""
+    payload = _state_decoder.decode(state, settings.JWT_SECRET, algorithms=[settings.JWT_ALGO])
+    return payload["fu"]
@@ -15,8 +15,20 @@ class Settings:
     OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "").strip()
 
     JWT_SECRET = os.getenv("JWT_SECRET", "dev-secret").strip()
+
+    # Comma-separated frontend origins allowed as OAuth redirect targets; others are rejected
+    ALLOWED_FRONTENDS = frozenset(
+        url.strip().rstrip("/")
+        for url in os.getenv(
+            "ALLOWED_FRONTENDS", "http://localhost:3000,https://llm-tools-frontend.vercel.app"
+        ).split(",")
+        if url.strip()
+    )
     JWT_ALGO = "HS256"
 
+    # Debug logs on hot paths are only formatted when this is DEBUG
+    LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").strip().upper()
+
     # Firebase credentials
     FIREBASE_PROJECT_ID = os.getenv("FIREBASE_PROJECT_ID", "").strip()
     FIREBASE_PRIVATE_KEY_ID = os.getenv("FIREBASE_PRIVATE_KEY_ID", "").strip()
@@ -1,38 +1,73 @@
+import time
+import threading
 import firebase_admin
+from functools import lru_cache
 from firebase_admin import credentials, firestore
 from app.config import settings
 
-if not firebase_admin._apps:
-    # Use environment variables for Firebase credentials
-    if not settings.FIREBASE_PROJECT_ID or not settings.FIREBASE_PRIVATE_KEY:
-        raise ValueError(
-            "Firebase credentials not found. Please set FIREBASE_* environment variables."
-        )
-    
-    # Construct credentials dict from environment variables
-    cred_dict = {
-        "type": "service_account",
-        "project_id": settings.FIREBASE_PROJECT_ID,
-        "private_key_id": settings.FIREBASE_PRIVATE_KEY_ID,
-        "private_key": settings.FIREBASE_PRIVATE_KEY.replace("\\n", "\n"),
-        "client_email": settings.FIREBASE_CLIENT_EMAIL,
-        "client_id": settings.FIREBASE_CLIENT_ID,
-        "auth_uri": settings.FIREBASE_AUTH_URI,
-        "token_uri": settings.FIREBASE_TOKEN_URI,
-        "auth_provider_x509_cert_url": settings.FIREBASE_AUTH_PROVIDER_X509_CERT_URL,
-        "client_x509_cert_url": settings.FIREBASE_CLIENT_X509_CERT_URL,
-        "universe_domain": settings.FIREBASE_UNIVERSE_DOMAIN,
-    }
-    cred = credentials.Certificate(cred_dict)
-    firebase_admin.initialize_app(cred)
-
-db = firestore.client(database_id="voicecalendar")
+_firebase_init_lock = threading.Lock()
+
+@lru_cache(maxsize=1)
+def get_db():
+    """
+    Get the Firestore client, initializing Firebase on first use.
+    Deferred so workers that never touch Firestore skip credential parsing.
+    """
+    # lru_cache doesn't serialize the first call, so guard init against concurrent callers
+    with _firebase_init_lock:
+        if not firebase_admin._apps:
+            # Use environment variables for Firebase credentials
+            if not settings.FIREBASE_PROJECT_ID or not settings.FIREBASE_PRIVATE_KEY:
+                raise ValueError(
+                    "Firebase credentials not found. Please set FIREBASE_* environment variables."
+                )
+        
+            # Construct credentials dict from environment variables
+            cred_dict = {
+                "type": "service_account",
+                "project_id": settings.FIREBASE_PROJECT_ID,
+                "private_key_id": settings.FIREBASE_PRIVATE_KEY_ID,
+                "private_key": settings.FIREBASE_PRIVATE_KEY.replace("\\n", "\n"),
+                "client_email": settings.FIREBASE_CLIENT_EMAIL,
+                "client_id": settings.FIREBASE_CLIENT_ID,
+                "auth_uri": settings.FIREBASE_AUTH_URI,
+                "token_uri": settings.FIREBASE_TOKEN_URI,
+                "auth_provider_x509_cert_url": settings.FIREBASE_AUTH_PROVIDER_X509_CERT_URL,
+                "client_x509_cert_url": settings.FIREBASE_CLIENT_X509_CERT_URL,
+                "universe_domain": settings.FIREBASE_UNIVERSE_DOMAIN,
+            }
+            cred = credentials.Certificate(cred_dict)
+            firebase_admin.initialize_app(cred)
+
+    return firestore.client(database_id="voicecalendar")
+
+# user_id -> (fetched_at, tokens); access tokens live ~1 hour so a short TTL is safe
+_TOKENS_CACHE_TTL = 60
+_TOKENS_CACHE_MAXSIZE = 1024
+_tokens_cache = {}
+_tokens_cache_lock = threading.Lock()
 
 def get_user_google_tokens(user_id: str) -> dict:
-    doc = db.document(f"users/{user_id}").get()
+    now = time.monotonic()
+    with _tokens_cache_lock:
+        entry = _tokens_cache.get(user_id)
+    if entry is not None and now - entry[0] < _TOKENS_CACHE_TTL:
+        return entry[1]
+
+    doc = get_db().document(f"users/{user_id}").get()
     if not doc.exists:
         raise ValueError("User not found")
 
     data = doc.to_dict()
-    return data["google_tokens"]
+    tokens = data["google_tokens"]
+    with _tokens_cache_lock:
+        if len(_tokens_cache) >= _TOKENS_CACHE_MAXSIZE:
+            _tokens_cache.pop(next(iter(_tokens_cache)))
+        _tokens_cache[user_id] = (now, tokens)
+    return tokens
+
+def invalidate_user_google_tokens(user_id: str):
+    """Drop cached tokens after they are rewritten (e.g. on re-login)"""
+    with _tokens_cache_lock:
+        _tokens_cache.pop(user_id, None)
 
@@ -1,8 +1,24 @@
+import threading
+from functools import lru_cache
 from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
+from googleapiclient.discovery import build, build_from_document
+from googleapiclient.discovery_cache import get_static_doc
 from app.config import settings
 
-def get_calendar_service(tokens: dict):
+# Built services per thread, keyed by token pair. The underlying httplib2 client is
+# not thread-safe, so each tool worker thread keeps its own copies.
+_SERVICE_CACHE_MAXSIZE = 256
+_local = threading.local()
+
+@lru_cache(maxsize=1)
+def _get_discovery_doc():
+    """
+    Calendar v3 discovery document bundled with googleapiclient, read once per process.
+    Passed as a string since build_from_document modifies a parsed dict in place.
+    """
+    return get_static_doc("calendar", "v3")
+
+def _build_calendar_service(tokens: dict):
     creds = Credentials(
         token=tokens["access_token"],
         refresh_token=tokens["refresh_token"],
@@ -11,4 +27,24 @@ def get_calendar_service(tokens: dict):
         client_secret=settings.GOOGLE_CLIENT_SECRET,
     )
 
-    return build("calendar", "v3", credentials=creds)
+    discovery_doc = _get_discovery_doc()
+    if discovery_doc is None:
+        return build("calendar", "v3", credentials=creds)
+    return build_from_document(discovery_doc, credentials=creds)
+
+def get_calendar_service(tokens: dict):
+    """
+    Calendar service for the given tokens, reused across tool calls on this thread.
+    Keyed on the token values, so re-login with new tokens builds a fresh service.
+    """
+    cache = getattr(_local, "services", None)
+    if cache is None:
+        cache = _local.services = {}
+
+    key = (tokens["access_token"], tokens["refresh_token"])
+    service = cache.get(key)
+    if service is None:
+        if len(cache) >= _SERVICE_CACHE_MAXSIZE:
+            cache.pop(next(iter(cache)))
+        service = cache[key] = _build_calendar_service(tokens)
+    return service
@@ -1,38 +1,20 @@
 """System prompts for the calendar assistant LLM"""
 
+from datetime import datetime
 
-def get_system_prompt(user_id: str, time_info: dict) -> str:
-    """
-    Generate the system prompt for the calendar assistant.
-    
-    Args:
-        user_id: The user's unique identifier
-        time_info: Dictionary with current date/time information from get_current_datetime_info()
-    
-    Returns:
-        The formatted system prompt string
-    """
-    from datetime import datetime
-    
-    return f"""You are a helpful calendar assistant. 
-You have access to tools to check calendar availability, find free slots, create events, and view upcoming events.
-The user ID is: {user_id}
 
-CURRENT DATE AND TIME CONTEXT:
-- Current date: {time_info['date']} ({time_info['datetime_full']})
-- Current time: {time_info['time']}
-- Current day of week: {datetime.fromisoformat(time_info['date']).strftime('%A')}
-- Current year: {time_info['year']}
-- Current month: {datetime.fromisoformat(time_info['date']).strftime('%B')}
-- Current day of month: {datetime.fromisoformat(time_info['date']).day}
+# Invariant rules come first and contain no per-user or per-call fields, so the
+# prompt prefix is identical across sessions and eligible for prompt caching
+_PROMPT_RULES = """You are a helpful calendar assistant. 
+You have access to tools to check calendar availability, find free slots, create events, and view upcoming events.
 
 CRITICAL RULES FOR DATE CALCULATION:
-- You MUST calculate dates yourself using the current date context above
+- You MUST calculate dates yourself using the current date context at the end of these instructions
 - When the user says "tomorrow", calculate: current date + 1 day
 - When the user says "next Monday", find the next Monday from today (if today is Monday, next Monday is 7 days away)
 - When the user says "next week", calculate: current date + 7 days
 - When the user says "last day of this month", calculate the last day of the current month
-- Always use the current date ({time_info['date']}) as your reference point
+- Always use the current date from the context below as your reference point
 - Convert relative dates to ISO format (YYYY-MM-DD) before calling create_event
 - Be precise: "next Monday" means the next occurrence of Monday, not "Monday of next week"
 
@@ -93,3 +75,40 @@ RESPONSE FORMAT REQUIREMENTS (TTS-FRIENDLY):
 - For calendar questions: provide ONE concise summary in natural spoken language
 - Keep responses brief, clear, and easy to understand when spoken aloud
 - Avoid technical jargon, ISO formats, or timezone codes in your spoken responses"""
+
+# Volatile fields go last so they don't break the cached prefix
+_CONTEXT_TMPL = """
+
+The user ID is: {user_id}
+
+CURRENT DATE AND TIME CONTEXT:
+- Current date: {date} ({datetime_full})
+- Current time: {time}
+- Current day of week: {weekday}
+- Current year: {year}
+- Current month: {month}
+- Current day of month: {day}"""
+
+
+def get_system_prompt(user_id: str, time_info: dict) -> str:
+    """
+    Generate the system prompt for the calendar assistant.
+    
+    Args:
+        user_id: The user's unique identifier
+        time_info: Dictionary with current date/time information from get_current_datetime_info()
+    
+    Returns:
+        The formatted system prompt string
+    """
+    current_date = datetime.fromisoformat(time_info['date'])
+    return _PROMPT_RULES + _CONTEXT_TMPL.format(
+        user_id=user_id,
+        date=time_info['date'],
+        datetime_full=time_info['datetime_full'],
+        time=time_info['time'],
+        weekday=current_date.strftime('%A'),
+        year=time_info['year'],
+        month=current_date.strftime('%B'),
+        day=current_date.day,
+    )
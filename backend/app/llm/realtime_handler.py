@@ -1,12 +1,16 @@
 """
 Handler for OpenAI Realtime API integration with tool support
 """
-import json
 import asyncio
-import base64
-from typing import Dict, Any
+import logging
+import pybase64
+import time
+import orjson
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Tuple
 from openai import OpenAI
 from fastapi import WebSocket, WebSocketDisconnect
+from websockets.exceptions import ConnectionClosed
 from app.llm.tools import (
     check_availability,
     find_available_slots,
@@ -15,11 +19,157 @@ from app.llm.tools import (
     get_current_time,
 )
 from app.llm.prompts import get_system_prompt
-from app.llm.tools import get_current_datetime_info
+from app.llm.tools import get_current_datetime_info, READ_ONLY_TOOLS
+
+logger = logging.getLogger(__name__)
+
+# Tool lookup and timezone-injection rules are static, so build them once
+_TOOL_MAP = {
+    "get_current_time": get_current_time,
+    "check_availability": check_availability,
+    "find_available_slots": find_available_slots,
+    "create_event": create_event,
+    "get_upcoming_events": get_upcoming_events,
+}
+_NEEDS_TZ = frozenset({"create_event", "get_upcoming_events", "check_availability"})
+
+# Tool definitions sent with session.update; shared by every handler
+_TOOLS_SCHEMA = [
+    {
+        "type": "function",
+        "name": "get_current_time",
+        "description": "Get the current date and time",
+        "parameters": {
+            "type": "object",
+            "properties": {},
+            "required": []
+        }
+    },
+    {
+        "type": "function",
+        "name": "check_availability",
+        "description": "Check user's calendar availability during a specified time period",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "start": {
+                    "type": "string",
+                    "description": "Start datetime in ISO format (YYYY-MM-DDTHH:MM:SS)"
+                },
+                "end": {
+                    "type": "string",
+                    "description": "End datetime in ISO format (YYYY-MM-DDTHH:MM:SS)"
+                }
+            },
+            "required": ["start", "end"]
+        }
+    },
+    {
+        "type": "function",
+        "name": "find_available_slots",
+        "description": "Find available time slots for meetings within a date range",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "start": {
+                    "type": "string",
+                    "description": "Start date in ISO format (YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS)"
+                },
+                "end": {
+                    "type": "string",
+                    "description": "End date in ISO format (YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS)"
+                },
+                "duration_minutes": {
+                    "type": "integer",
+                    "description": "Desired meeting duration in minutes (default: 30)"
+                }
+            },
+            "required": ["start", "end"]
+        }
+    },
+    {
+        "type": "function",
+        "name": "create_event",
+        "description": "Create a new event on the user's Google Calendar",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "title": {
+                    "type": "string",
+                    "description": "Event title/summary"
+                },
+                "start": {
+                    "type": "string",
+                    "description": "Start datetime in ISO format (YYYY-MM-DDTHH:MM:SS)"
+                },
+                "end": {
+                    "type": "string",
+                    "description": "End datetime in ISO format (YYYY-MM-DDTHH:MM:SS)"
+                },
+                "description": {
+                    "type": "string",
+                    "description": "Event description (optional)"
+                }
+            },
+            "required": ["title", "start", "end"]
+        }
+    },
+    {
+        "type": "function",
+        "name": "get_upcoming_events",
+        "description": "Get upcoming events for the user",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "hours": {
+                    "type": "integer",
+                    "description": "Number of hours to look ahead (default: 24)"
+                }
+            },
+            "required": []
+        }
+    }
+]
+
+# Inbound audio is coalesced and sent to the Realtime API once either limit is hit
+_AUDIO_FLUSH_BYTES = 32_768
+_AUDIO_FLUSH_INTERVAL = 0.04  # seconds
+
+# Outbound events are coalesced into {"type": "batch", "events": [...]} frames.
+# When the queue is full, audio deltas evict the oldest queued event instead of waiting
+_TX_QUEUE_SIZE = 512
+_TX_BATCH_MAX = 32
+_TX_BATCH_WINDOW = 0.005  # seconds
+
+# Event types logged individually at debug level
+_LOGGED_EVENT_TYPES = frozenset({
+    "response.created", "response.output_item.done", "response.done", "response.audio.delta",
+    "response.audio_transcript.delta", "response.text.delta", "response.output_item.added",
+})
+
+# System prompts keyed by (user_id, minute), so reconnects within a minute reuse the same string
+_PROMPT_CACHE: Dict[Tuple[str, int], str] = {}
+_PROMPT_CACHE_MAX = 1024
+
+
+def _get_cached_system_prompt(user_id: str) -> str:
+    """System prompt for the user, rebuilt at most once per minute"""
+    key = (user_id, int(time.time() // 60))
+    prompt = _PROMPT_CACHE.get(key)
+    if prompt is None:
+        if len(_PROMPT_CACHE) >= _PROMPT_CACHE_MAX:
+            _PROMPT_CACHE.clear()  # Mostly entries from past minutes
+        prompt = get_system_prompt(user_id, get_current_datetime_info())
+        _PROMPT_CACHE[key] = prompt
+    return prompt
 
 
 class RealtimeHandler:
-    """Handles Realtime API communication and tool calls"""
+    """
+    Handles Realtime API communication and tool calls.
+    Meant to run on uvloop (uvicorn --loop uvloop), since every event
+    goes through several small awaits on the event loop.
+    """
     
     def __init__(self, user_id: str, websocket: WebSocket, client: OpenAI, user_timezone: str = "+00:00"):
         self.user_id = user_id
@@ -27,131 +177,40 @@ class RealtimeHandler:
         self.client = client
         self.user_timezone = user_timezone  # Store user's timezone offset (e.g., "+05:30", "-05:00")
         self.session = None
+        self._session_send = None  # session.send, bound once the session is open
         self._stop_flag = False  # Flag to signal cancellation
-        self._recv_lock = asyncio.Lock()  # Lock to ensure only one recv() call at a time
-        self.tool_map = {
-            "get_current_time": get_current_time,
-            "check_availability": check_availability,
-            "find_available_slots": find_available_slots,
-            "create_event": create_event,
-            "get_upcoming_events": get_upcoming_events,
-        }
-        # Store config for later use
-        time_info = get_current_datetime_info()
-        self.system_prompt = get_system_prompt(self.user_id, time_info)
-        self.tools = self._define_tools()
-        print(f"[REALTIME] Initialized handler with timezone: {self.user_timezone}")
+        # Dedicated thread for the blocking session.recv() loop, kept hot between events
+        self._recv_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"rt-recv-{user_id}")
+        self._tool_tasks = set()  # In-flight tool calls, so several calls in one turn overlap
+        self._mutation_lock = asyncio.Lock()  # Serializes calendar-mutating tool calls
+        self._audio_buffer = bytearray()  # Audio waiting to be sent as one append event
+        self._last_audio_flush = time.monotonic()
+        self._tx_queue = asyncio.Queue(maxsize=_TX_QUEUE_SIZE)  # Events waiting to go to the frontend
+        self._close_task = None  # Closes the WebSocket if the sender stops on its own
+        self.tool_map = _TOOL_MAP
+        # Store config for later use; the prompt is built on first use
+        self._system_prompt = None
+        self.tools = _TOOLS_SCHEMA
+        logger.debug("Initialized handler with timezone: %s", self.user_timezone)
     
-    def _define_tools(self):
-        """Define tools for Realtime API"""
-        return [
-            {
-                "type": "function",
-                "name": "get_current_time",
-                "description": "Get the current date and time",
-                "parameters": {
-                    "type": "object",
-                    "properties": {},
-                    "required": []
-                }
-            },
-            {
-                "type": "function",
-                "name": "check_availability",
-                "description": "Check user's calendar availability during a specified time period",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "start": {
-                            "type": "string",
-                            "description": "Start datetime in ISO format (YYYY-MM-DDTHH:MM:SS)"
-                        },
-                        "end": {
-                            "type": "string",
-                            "description": "End datetime in ISO format (YYYY-MM-DDTHH:MM:SS)"
-                        }
-                    },
-                    "required": ["start", "end"]
-                }
-            },
-            {
-                "type": "function",
-                "name": "find_available_slots",
-                "description": "Find available time slots for meetings within a date range",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "start": {
-                            "type": "string",
-                            "description": "Start date in ISO format (YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS)"
-                        },
-                        "end": {
-                            "type": "string",
-                            "description": "End date in ISO format (YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS)"
-                        },
-                        "duration_minutes": {
-                            "type": "integer",
-                            "description": "Desired meeting duration in minutes (default: 30)"
-                        }
-                    },
-                    "required": ["start", "end"]
-                }
-            },
-            {
-                "type": "function",
-                "name": "create_event",
-                "description": "Create a new event on the user's Google Calendar",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "title": {
-                            "type": "string",
-                            "description": "Event title/summary"
-                        },
-                        "start": {
-                            "type": "string",
-                            "description": "Start datetime in ISO format (YYYY-MM-DDTHH:MM:SS)"
-                        },
-                        "end": {
-                            "type": "string",
-                            "description": "End datetime in ISO format (YYYY-MM-DDTHH:MM:SS)"
-                        },
-                        "description": {
-                            "type": "string",
-                            "description": "Event description (optional)"
-                        }
-                    },
-                    "required": ["title", "start", "end"]
-                }
-            },
-            {
-                "type": "function",
-                "name": "get_upcoming_events",
-                "description": "Get upcoming events for the user",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "hours": {
-                            "type": "integer",
-                            "description": "Number of hours to look ahead (default: 24)"
-                        }
-                    },
-                    "required": []
-                }
-            }
-        ]
+    @property
+    def system_prompt(self) -> str:
+        """System prompt for this session, built when the session is configured"""
+        if self._system_prompt is None:
+            self._system_prompt = _get_cached_system_prompt(self.user_id)
+        return self._system_prompt
     
     async def handle_connection(self):
         """Handle the WebSocket connection and Realtime API events"""
         # Send connection confirmation immediately
         try:
-            await self.websocket.send_json({
+            await self._send_json({
                 "type": "connection.update",
                 "status": "connected"
             })
-            print(f"[REALTIME] Sent connection confirmation to frontend")
+            logger.debug("Sent connection confirmation to frontend")
         except Exception as e:
-            print(f"[REALTIME] Error sending connection confirmation: {e}")
+            logger.warning("Error sending connection confirmation: %s", e)
         
         # Create Realtime API session - it's a context manager (has 'enter' method)
         session_manager = self.client.beta.realtime.connect(
@@ -162,7 +221,8 @@ class RealtimeHandler:
         try:
             with session_manager as session:
                 self.session = session
-                print(f"[REALTIME] Realtime session established")
+                self._session_send = session.send
+                logger.info("Realtime session established for user %s", self.user_id)
                 
                 # Send initial configuration via session.update event
                 # The session has a send() method
@@ -189,196 +249,286 @@ class RealtimeHandler:
                             },
                         }
                     })
-                    print(f"[REALTIME] Sent session configuration with turn detection")
+                    logger.debug("Sent session configuration with turn detection")
                 except Exception as e:
-                    print(f"[REALTIME] Error sending session update: {e}")
-                    import traceback
-                    traceback.print_exc()
+                    logger.exception("Error sending session update: %s", e)
                 
                 # Start background task to forward Realtime API events to WebSocket
-                print(f"[REALTIME] Starting background task to forward Realtime events")
+                logger.debug("Starting background task to forward Realtime events")
                 forward_task = asyncio.create_task(self._forward_realtime_events())
+                # Flush buffered audio on a timer so a quiet mic isn't delayed for VAD
+                audio_flush_task = asyncio.create_task(self._audio_flush_loop())
+                # Send queued events to the frontend in batches
+                tx_task = asyncio.create_task(self._tx_sender())
+                tx_task.add_done_callback(self._on_tx_sender_done)
                 
                 try:
                     # Handle WebSocket messages from frontend
-                    print(f"[REALTIME] Starting WebSocket message receive loop")
+                    logger.debug("Starting WebSocket message receive loop")
                     message_count = 0
+                    debug_enabled = logger.isEnabledFor(logging.DEBUG)
+                    receive_bytes = self.websocket.receive_bytes
+                    handle_audio = self._handle_audio_data
                     while True:
                         try:
-                            data = await self.websocket.receive()
-                            message_count += 1
-                            
-                            # Log every message for debugging
-                            if message_count <= 5 or message_count % 100 == 0:
-                                print(f"[REALTIME] Received message #${message_count}, keys: {list(data.keys())}")
-                            
-                            # Check if it's a disconnect message
-                            if data.get("type") == "websocket.disconnect":
-                                print(f"[REALTIME] Received disconnect message")
-                                break
-                            
-                            # Handle binary audio data (frontend only sends binary audio)
-                            if "bytes" in data:
-                                # Handle binary audio data
-                                audio_data = data["bytes"]
-                                audio_size = len(audio_data)
+                            # Frontend only sends binary audio, so read the bytes directly
+                            # (raises WebSocketDisconnect on disconnect)
+                            audio_data = await receive_bytes()
+                            if debug_enabled:
+                                message_count += 1
                                 if message_count <= 5 or message_count % 100 == 0:
-                                    print(f"[REALTIME] Received binary audio data: {audio_size} bytes")
-                                await self._handle_audio_data(audio_data)
-                            else:
-                                print(f"[REALTIME] Received unknown data type (message #{message_count}): {list(data.keys())}, full data: {data}")
+                                    logger.debug("Received binary audio data (message #%d): %d bytes", message_count, len(audio_data))
+                            await handle_audio(audio_data)
                         except WebSocketDisconnect:
-                            print(f"[REALTIME] WebSocket disconnected")
+                            logger.debug("WebSocket disconnected")
                             break
                         except RuntimeError as e:
                             # Handle "Cannot call receive once a disconnect message has been received"
                             if "disconnect" in str(e).lower():
-                                print(f"[REALTIME] WebSocket already disconnected")
+                                logger.debug("WebSocket already disconnected")
                                 break
                             raise
-                        except json.JSONDecodeError:
-                            print(f"[REALTIME] Invalid JSON received")
-                            # Continue loop for JSON errors
+                        except KeyError:
+                            # Text frames carry no "bytes"
+                            logger.warning("Ignoring non-binary message from frontend")
                         except Exception as e:
-                            print(f"[REALTIME] Error handling message: {e}")
-                            import traceback
-                            traceback.print_exc()
+                            logger.exception("Error handling message: %s", e)
                             # Check if it's a disconnect-related error
                             if "disconnect" in str(e).lower():
                                 break
                 finally:
-                    print(f"[REALTIME] Cleaning up - setting stop flag and cancelling tasks")
+                    logger.debug("Cleaning up - setting stop flag, closing session and cancelling tasks")
                     self._stop_flag = True
+                    audio_flush_task.cancel()
+                    tx_task.cancel()
+                    # Close the session first so the recv() blocked in the executor returns right away
+                    # (close() does the closing handshake, so keep it off the event loop)
+                    try:
+                        await asyncio.to_thread(session.close)
+                    except Exception as e:
+                        logger.warning("Error closing Realtime session: %s", e)
                     forward_task.cancel()
                     try:
-                        await asyncio.wait_for(forward_task, timeout=2.0)
-                    except asyncio.TimeoutError:
-                        print(f"[REALTIME] Forward task didn't cancel in time, forcing close")
+                        await forward_task
                     except asyncio.CancelledError:
-                        print(f"[REALTIME] Forward task cancelled successfully")
+                        logger.debug("Forward task cancelled successfully")
                     except Exception as e:
-                        print(f"[REALTIME] Error cancelling forward task: {e}")
+                        logger.error("Error cancelling forward task: %s", e)
         except Exception as e:
-            print(f"[REALTIME] Error with Realtime session: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error with Realtime session: %s", e)
     
     async def _handle_audio_data(self, audio_data: bytes):
-        """Handle binary audio data from frontend - stream directly to Realtime API"""
+        """Handle binary audio data from frontend - buffer it and stream to Realtime API"""
         if self.session:
-            # Send audio data to Realtime API via input_audio_buffer.append event
-            # The buffer.append() method doesn't take arguments - we send events instead
-            try:
-                # Encode audio as base64 and send as an event
-                audio_base64 = base64.b64encode(audio_data).decode('utf-8')
-                self.session.send({
-                    "type": "input_audio_buffer.append",
-                    "audio": audio_base64
-                })
-                print(f"[REALTIME] Sent {len(audio_data)} bytes to input buffer")
-            except Exception as e:
-                print(f"[REALTIME] Error sending audio: {e}")
-                import traceback
-                traceback.print_exc()
+            self._audio_buffer += audio_data
+            if (len(self._audio_buffer) >= _AUDIO_FLUSH_BYTES
+                    or time.monotonic() - self._last_audio_flush >= _AUDIO_FLUSH_INTERVAL):
+                self._flush_audio()
         else:
-            print(f"[REALTIME] WARNING: Received audio but session is None")
+            logger.warning("Received audio but session is None")
+    
+    def _flush_audio(self):
+        """Send all buffered audio to the Realtime API as a single append event"""
+        self._last_audio_flush = time.monotonic()
+        if not self._audio_buffer or not self.session:
+            return
+        # Send audio data to Realtime API via input_audio_buffer.append event
+        # The buffer.append() method doesn't take arguments - we send events instead
+        try:
+            # Encode audio as base64 and send as an event
+            audio_base64 = pybase64.b64encode_as_string(self._audio_buffer)
+            audio_size = len(self._audio_buffer)
+            self._audio_buffer.clear()
+            self._session_send({
+                "type": "input_audio_buffer.append",
+                "audio": audio_base64
+            })
+            logger.debug("Sent %d bytes to input buffer", audio_size)
+        except Exception as e:
+            logger.exception("Error sending audio: %s", e)
+    
+    async def _audio_flush_loop(self):
+        """Periodically flush residual buffered audio"""
+        while not self._stop_flag:
+            await asyncio.sleep(_AUDIO_FLUSH_INTERVAL)
+            if time.monotonic() - self._last_audio_flush >= _AUDIO_FLUSH_INTERVAL:
+                self._flush_audio()
     
     async def _forward_realtime_events(self):
         """Forward Realtime API events to WebSocket client"""
-        print(f"[REALTIME] _forward_realtime_events task started")
+        logger.debug("_forward_realtime_events task started")
+        # Bind hot-path callables once; the session stays the same for the life of this loop
+        run_in_executor = asyncio.get_running_loop().run_in_executor
+        recv_executor = self._recv_executor
+        recv = self.session.recv
+        to_dict = self._event_to_dict
+        enqueue = self._tx_queue.put
+        enqueue_audio = self._enqueue_audio
         try:
             # The session has recv() method to receive events
             # recv() is blocking and cannot be called concurrently
-            # We must ensure only one recv() call is active at a time
             while not self._stop_flag:
                 try:
                     # Check stop flag before attempting recv
                     if self._stop_flag:
-                        print(f"[REALTIME] Stop flag set, exiting event loop")
+                        logger.debug("Stop flag set, exiting event loop")
                         break
                     
-                    # Use lock to ensure only one recv() call at a time
-                    # The lock prevents concurrent calls
-                    async with self._recv_lock:
-                        # Run recv() in thread pool - it will block until an event is received
-                        # We don't use timeout because recv() cannot be cancelled mid-call
-                        # Instead, we rely on the stop flag and session.close() for cleanup
-                        try:
-                            event = await asyncio.to_thread(self.session.recv)
-                        except Exception as e:
-                            # If recv() fails (e.g., connection closed), check stop flag
-                            if self._stop_flag:
-                                print(f"[REALTIME] Stop flag set, exiting after recv error")
-                                break
-                            # Re-raise to handle in outer exception handler
-                            raise
+                    # No lock needed: this loop is the only recv() caller and it awaits
+                    # each call before issuing the next, so calls can never overlap
+                    # Run recv() in the dedicated thread - it will block until an event is received
+                    # We don't use timeout because recv() cannot be cancelled mid-call
+                    # Instead, we rely on the stop flag and session.close() for cleanup
+                    try:
+                        event = await run_in_executor(recv_executor, recv)
+                    except Exception as e:
+                        # If recv() fails (e.g., connection closed), check stop flag
+                        if self._stop_flag:
+                            logger.debug("Stop flag set, exiting after recv error")
+                            break
+                        # Re-raise to handle in outer exception handler
+                        raise
+                    
+                    # Fast path for the most frequent event: the frontend only needs the delta
+                    # of an audio chunk, so skip model_dump() and the generic handling below
+                    if getattr(event, "type", None) == "response.audio.delta":
+                        delta = event.delta
+                        if logger.isEnabledFor(logging.DEBUG):
+                            logger.debug("Audio delta received: %d chars (base64), ~%d bytes decoded", len(delta), len(delta) * 3 // 4)
+                        enqueue_audio({"type": "response.audio.delta", "delta": delta})
+                        continue
                     
                     # Convert event object to dictionary
-                    event_dict = self._event_to_dict(event)
+                    event_dict = to_dict(event)
                     
                     event_type = event_dict.get('type', 'unknown')
                     
                     # Log important events for debugging
-                    if event_type in ["response.created", "response.output_item.done", "response.done", "response.audio.delta", 
-                                     "response.audio_transcript.delta", "response.text.delta", "response.output_item.added"]:
-                        print(f"[REALTIME] Received event: {event_type}")
-                        if event_type == "response.created":
-                            print(f"[REALTIME] New response created: {event_dict.get('response', {}).get('id', 'N/A')}")
-                        elif event_type == "response.output_item.done":
-                            print(f"[REALTIME] Output item done: {event_dict.get('item', {}).get('type', 'N/A')}")
-                        elif event_type == "response.audio.delta":
-                            delta_len = len(event_dict.get('delta', ''))
-                            print(f"[REALTIME] Audio delta received: {delta_len} chars (base64), ~{delta_len * 3 // 4} bytes decoded")
-                        elif event_type == "response.text.delta":
-                            print(f"[REALTIME] Text delta received: {event_dict.get('delta', '')[:50]}")
-                    elif not event_type.startswith("rate_limits") and not event_type.startswith("conversation.item.input_audio"):
-                        # Log other events except rate limits and input audio transcription
-                        print(f"[REALTIME] Received event: {event_type}")
+                    if logger.isEnabledFor(logging.DEBUG):
+                        if event_type in _LOGGED_EVENT_TYPES:
+                            logger.debug("Received event: %s", event_type)
+                            if event_type == "response.created":
+                                logger.debug("New response created: %s", event_dict.get('response', {}).get('id', 'N/A'))
+                            elif event_type == "response.output_item.done":
+                                logger.debug("Output item done: %s", event_dict.get('item', {}).get('type', 'N/A'))
+                            elif event_type == "response.text.delta":
+                                logger.debug("Text delta received: %s", event_dict.get('delta', '')[:50])
+                        elif not event_type.startswith(("rate_limits", "conversation.item.input_audio")):
+                            # Log other events except rate limits and input audio transcription
+                            logger.debug("Received event: %s", event_type)
                     
                     # Handle error events
                     if event_type == "error":
-                        error_message = event_dict.get('error', {}).get('message', 'Unknown error') if isinstance(event_dict.get('error'), dict) else str(event_dict.get('error', 'Unknown error'))
-                        error_code = event_dict.get('error', {}).get('code', 'unknown') if isinstance(event_dict.get('error'), dict) else 'unknown'
-                        print(f"[REALTIME] ERROR: {error_message} (code: {error_code})")
-                        print(f"[REALTIME] Full error event: {event_dict}")
+                        err = event_dict.get('error')
+                        if isinstance(err, dict):
+                            error_message = err.get('message', 'Unknown error')
+                            error_code = err.get('code', 'unknown')
+                        else:
+                            error_message = str(err or 'Unknown error')
+                            error_code = 'unknown'
+                        logger.error("Realtime API error: %s (code: %s)", error_message, error_code)
+                        logger.debug("Full error event: %s", event_dict)
                         # Forward error to frontend
-                        await self.websocket.send_json(event_dict)
+                        await enqueue(event_dict)
                         continue
                     
                     # Handle tool calls
                     if event_type == "response.function_call_arguments.done":
-                        await self._handle_tool_call(event_dict)
+                        self._start_tool_call(event_dict)
                     
-                    # Forward all events as JSON to frontend
+                    # Forward all events as JSON to frontend (queued, sent in batches)
                     # Audio events contain base64-encoded audio in the delta field
                     # Frontend will handle decoding and playback
-                    await self.websocket.send_json(event_dict)
+                    await enqueue(event_dict)
                     
                 except asyncio.CancelledError:
-                    print(f"[REALTIME] _forward_realtime_events task cancelled")
+                    logger.debug("_forward_realtime_events task cancelled")
                     raise
-                except Exception as e:
-                    # Check if it's a connection closed error
-                    error_str = str(e).lower()
-                    if "closed" in error_str or "disconnect" in error_str or "connection" in error_str:
-                        print(f"[REALTIME] Realtime connection closed: {e}")
-                        break
+                except (ConnectionClosed, ConnectionError) as e:
+                    logger.info("Realtime connection closed: %s", e)
+                    break
+                except Exception:
                     if self._stop_flag:
-                        print(f"[REALTIME] Stop flag set, exiting event loop")
+                        logger.debug("Stop flag set, exiting event loop")
                         break
-                    print(f"[REALTIME] Error in _forward_realtime_events: {e}")
-                    import traceback
-                    traceback.print_exc()
+                    logger.exception("Error in _forward_realtime_events")
                     # Continue loop to try receiving again
                     await asyncio.sleep(0.1)
                 
         except asyncio.CancelledError:
-            print(f"[REALTIME] _forward_realtime_events task cancelled")
+            logger.debug("_forward_realtime_events task cancelled")
             raise
         except Exception as e:
-            print(f"[REALTIME] Error forwarding events: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error forwarding events: %s", e)
+    
+    async def _send_json(self, data: Dict[str, Any]):
+        """Send JSON to the frontend as a binary frame, serialized with orjson"""
+        await self.websocket.send_bytes(orjson.dumps(data))
+    
+    def _enqueue_audio(self, event: Dict[str, Any]):
+        """Queue an audio delta without waiting, dropping the oldest event if the queue is full"""
+        try:
+            self._tx_queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self._tx_queue.get_nowait()
+            self._tx_queue.put_nowait(event)
+            logger.warning("Frontend send queue full, dropped oldest event")
+    
+    def _on_tx_sender_done(self, task: asyncio.Task):
+        """Log why the sender stopped and close the WebSocket so the session is torn down"""
+        if task.cancelled():
+            return
+        exc = task.exception()
+        if exc is not None:
+            logger.error("Frontend sender task failed: %s", exc, exc_info=exc)
+        self._stop_flag = True
+        self._close_task = asyncio.create_task(self._close_websocket())
+    
+    async def _close_websocket(self):
+        """Close the frontend WebSocket, ignoring errors if it is already gone"""
+        try:
+            await self.websocket.close()
+        except Exception as e:
+            logger.debug("WebSocket already closed: %s", e)
+    
+    async def _tx_sender(self):
+        """Drain queued events and send them to the frontend, several per frame"""
+        loop_time = asyncio.get_running_loop().time
+        get = self._tx_queue.get
+        get_nowait = self._tx_queue.get_nowait
+        send_bytes = self.websocket.send_bytes
+        dumps = orjson.dumps
+        while True:
+            batch = [await get()]
+            deadline = loop_time() + _TX_BATCH_WINDOW
+            while len(batch) < _TX_BATCH_MAX:
+                try:
+                    batch.append(get_nowait())
+                    continue
+                except asyncio.QueueEmpty:
+                    pass
+                remaining = deadline - loop_time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            
+            try:
+                if len(batch) == 1:
+                    await send_bytes(dumps(batch[0]))
+                else:
+                    await send_bytes(dumps({"type": "batch", "events": batch}))
+            except WebSocketDisconnect:
+                logger.debug("WebSocket disconnected, stopping frontend sender")
+                return
+            except RuntimeError as e:
+                # Starlette raises RuntimeError when sending after the socket has closed
+                logger.debug("WebSocket closed, stopping frontend sender: %s", e)
+                return
+            except Exception as e:
+                logger.exception("Error sending events to frontend: %s", e)
     
     def _event_to_dict(self, event) -> Dict[str, Any]:
         """Convert Realtime API event to dictionary"""
@@ -391,6 +541,12 @@ class RealtimeHandler:
         else:
             return {"type": str(type(event).__name__), "data": str(event)}
     
+    def _start_tool_call(self, event: Dict[str, Any]):
+        """Run a tool call in the background instead of blocking event forwarding"""
+        task = asyncio.create_task(self._handle_tool_call(event))
+        self._tool_tasks.add(task)
+        task.add_done_callback(self._tool_tasks.discard)
+    
     async def _handle_tool_call(self, event: Dict[str, Any]):
         """Handle tool calls from Realtime API"""
         try:
@@ -400,11 +556,11 @@ class RealtimeHandler:
             
             # Parse arguments
             if isinstance(arguments_str, str):
-                arguments = json.loads(arguments_str)
+                arguments = orjson.loads(arguments_str)
             else:
                 arguments = arguments_str
             
-            print(f"[REALTIME] Tool call: {function_name} with args: {arguments}")
+            logger.debug("Tool call: %s with args: %s", function_name, arguments)
             
             # Get the tool function
             tool_func = self.tool_map.get(function_name)
@@ -415,24 +571,29 @@ class RealtimeHandler:
                 arguments["user_id"] = self.user_id
                 
                 # Add timezone if needed (use the user's timezone from connection)
-                if function_name in ["create_event", "get_upcoming_events", "check_availability"]:
+                if function_name in _NEEDS_TZ:
                     arguments.setdefault("user_timezone", self.user_timezone)
-                    print(f"[REALTIME] Using timezone {self.user_timezone} for tool {function_name}")
+                    logger.debug("Using timezone %s for tool %s", self.user_timezone, function_name)
                 
-                # Call the tool
+                # Call the tool (sync tools run in an executor, so calls don't block each other)
+                # Mutating tools are serialized so concurrent calls can't double-book a slot
                 try:
-                    result = tool_func.invoke(arguments)
+                    if function_name in READ_ONLY_TOOLS:
+                        result = await tool_func.ainvoke(arguments)
+                    else:
+                        async with self._mutation_lock:
+                            result = await tool_func.ainvoke(arguments)
                 except Exception as e:
                     result = f"Error: {str(e)}"
-                    import traceback
-                    traceback.print_exc()
+                    logger.exception("Tool %s failed", function_name)
             
             # Provide tool result to Realtime API
             # The Realtime API doesn't support sending function_call_output as an event
             # However, we can inject the tool result into the conversation so the API can use it
             # This allows the API to generate a response based on the tool result
-            print(f"[REALTIME] Tool execution completed for call_id {call_id}")
-            print(f"[REALTIME] Tool result: {result[:200]}...")
+            logger.debug("Tool execution completed for call_id %s", call_id)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Tool result: %s...", str(result)[:200])
             
             # Inject the tool result into the conversation so the API can use it
             # The Realtime API doesn't have a direct way to provide tool results,
@@ -440,8 +601,7 @@ class RealtimeHandler:
             try:
                 # Format the tool result as a natural language message
                 if isinstance(result, dict):
-                    # Format dict results nicely
-                    result_str = json.dumps(result, indent=2)
+                    result_str = orjson.dumps(result).decode()
                 else:
                     result_str = str(result)
                 
@@ -464,38 +624,36 @@ class RealtimeHandler:
                         ]
                     }
                 })
-                print(f"[REALTIME] Injected tool result into conversation")
+                logger.debug("Injected tool result into conversation")
                 
                 # With turn_detection enabled, the API should automatically generate a response
                 # after seeing the tool result. However, since we're injecting it as an assistant
                 # message, we may need to explicitly request a response.
-                # Small delay to ensure the conversation item is processed
-                await asyncio.sleep(0.2)
+                # No delay needed: the API handles client events in the order they are sent
                 
                 # Request a new response from the API
                 # The API should use the session's modalities configuration (audio + text)
                 # Just send response.create without parameters - it should use session defaults
                 self.session.send({"type": "response.create"})
-                print(f"[REALTIME] Requested new response after tool result (should use session audio config)")
+                logger.debug("Requested new response after tool result (should use session audio config)")
             except Exception as e:
-                print(f"[REALTIME] Error injecting tool result: {e}")
-                import traceback
-                traceback.print_exc()
+                logger.exception("Error injecting tool result: %s", e)
             
         except Exception as e:
-            print(f"[REALTIME] Error handling tool call: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error handling tool call: %s", e)
     
     async def cleanup(self):
         """Cleanup resources"""
-        print(f"[REALTIME] Cleanup called - setting stop flag")
+        logger.debug("Cleanup called - setting stop flag")
         self._stop_flag = True
+        for task in list(self._tool_tasks):
+            task.cancel()
         if self.session:
             try:
                 self.session.close()
-                print(f"[REALTIME] Realtime session closed")
+                logger.debug("Realtime session closed")
             except Exception as e:
-                print(f"[REALTIME] Error closing Realtime session: {e}")
+                logger.warning("Error closing Realtime session: %s", e)
         # Session is cleaned up automatically when exiting the async with block
         self.session = None
+        self._recv_executor.shutdown(wait=False, cancel_futures=True)
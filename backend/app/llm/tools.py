@@ -1,13 +1,37 @@
+import logging
+import threading
+from concurrent.futures import Future
 from datetime import datetime, timedelta, timezone
+from time import monotonic, time
+from types import MappingProxyType
 from langchain_core.tools import tool
 from google.auth.exceptions import RefreshError
 from app.db.firestore import get_user_google_tokens
 from app.llm.google_calendar import get_calendar_service
 
+logger = logging.getLogger(__name__)
+
+
+# Events are only read for their summary and start/end, so list calls ask for just those.
+# maxResults is the API maximum, so a busy window isn't cut off at the default page size.
+_LIST_FIELDS = "items(summary,start,end)"
+_LIST_MAX_RESULTS = 2500
+
+# find_available_slots lists at most this many slots, so a wide range stays speakable
+_MAX_SLOTS = 20
+
+# Offset strings that mean UTC; create_event skips offset parsing and conversion for these
+_UTC_OFFSETS = frozenset({None, "", "UTC", "Z", "+00:00", "-00:00", "+0000"})
+
+# Canonical "+HH:MM" string -> parsed timezone. Other spellings are parsed but not
+# cached, so the key space stays bounded by the fixed-width form
+_TZ_CACHE = {"": timezone.utc, "UTC": timezone.utc}
+
 
 def parse_timezone_offset(offset_str: str) -> timezone:
     """
     Parse a timezone offset string (e.g., "+05:30", "-05:00") into a timezone object.
+    Canonical "+HH:MM" offsets are cached, so repeat calls return the same object.
     
     Args:
         offset_str: Timezone offset in format "+HH:MM" or "-HH:MM" (e.g., "+05:30", "-05:00")
@@ -15,15 +39,24 @@ def parse_timezone_offset(offset_str: str) -> timezone:
     Returns:
         timezone object representing the offset
     """
-    if not offset_str or offset_str == "UTC":
+    if not offset_str:
         return timezone.utc
+    tz = _TZ_CACHE.get(offset_str)
+    if tz is not None:
+        return tz
     
     # Parse offset string (e.g., "+05:30" or "-05:00")
     try:
         sign = offset_str[0]
-        parts = offset_str[1:].split(":")
-        hours = int(parts[0])
-        minutes = int(parts[1]) if len(parts) > 1 else 0
+        canonical = len(offset_str) == 6 and offset_str[3] == ":"
+        if canonical:
+            # Common "+HH:MM" form - slice the fields directly
+            hours = int(offset_str[1:3])
+            minutes = int(offset_str[4:6])
+        else:
+            parts = offset_str[1:].split(":")
+            hours = int(parts[0])
+            minutes = int(parts[1]) if len(parts) > 1 else 0
         
         # Create timedelta (negative for ahead of UTC, positive for behind)
         # But Python timezone uses positive for ahead, negative for behind
@@ -32,9 +65,12 @@ def parse_timezone_offset(offset_str: str) -> timezone:
         else:  # sign == "-"
             delta = timedelta(hours=-hours, minutes=-minutes)
         
-        return timezone(delta)
+        tz = timezone(delta)
+        if canonical and sign in "+-" and offset_str[1:3].isdigit() and offset_str[4:6].isdigit():
+            _TZ_CACHE[offset_str] = tz
+        return tz
     except (ValueError, IndexError) as e:
-        print(f"[TOOL] Invalid timezone offset '{offset_str}', falling back to UTC: {e}")
+        logger.warning("Invalid timezone offset '%s', falling back to UTC: %s", offset_str, e)
         return timezone.utc
 
 
@@ -48,28 +84,91 @@ def format_datetime_for_api(dt: datetime) -> str:
     Returns:
         ISO format string with Z notation for UTC (e.g., "2026-01-29T13:24:48.754095Z")
     """
-    # Make timezone-aware (UTC) if naive
-    if dt.tzinfo is None:
-        dt = dt.replace(tzinfo=timezone.utc)
+    # Naive datetimes are treated as UTC, so just append Z
+    tzinfo = dt.tzinfo
+    if tzinfo is None:
+        return f"{dt.isoformat()}Z"
+    
+    # UTC isoformat always ends with +00:00 - swap the suffix for Z
+    if tzinfo is timezone.utc:
+        return f"{dt.isoformat()[:-6]}Z"
     
     # Format for Google Calendar API (replace +00:00 with Z)
     return dt.isoformat().replace('+00:00', 'Z')
 
 
+_MONTHS = (
+    "", "January", "February", "March", "April", "May", "June",
+    "July", "August", "September", "October", "November", "December",
+)
+
+
+def _format_clock(dt: datetime) -> str:
+    """12-hour time without a leading zero (e.g. "2:30 PM"), built without strftime"""
+    hour = dt.hour
+    return f"{(hour - 1) % 12 + 1}:{dt.minute:02d} {'PM' if hour >= 12 else 'AM'}"
+
+
+def _event_bounds(e: dict) -> tuple:
+    """
+    Start and end strings of a Calendar event: dateTime for timed events, date for all-day ones.
+    The `or` only does the second lookup when dateTime is missing.
+    """
+    s = e['start']
+    ee = e['end']
+    return s.get('dateTime') or s.get('date', 'Unknown'), ee.get('dateTime') or ee.get('date', 'Unknown')
+
+
+def _parse_gcal_dt(s: str) -> datetime:
+    """
+    Parse a Google Calendar dateTime/date string.
+    Handles the trailing Z for UTC by slicing it off, rather than rewriting the string.
+    """
+    if s[-1] == 'Z':
+        return datetime.fromisoformat(s[:-1]).replace(tzinfo=timezone.utc)
+    return datetime.fromisoformat(s)
+
+
+def _to_utc_seconds(dt: datetime) -> int:
+    """Epoch seconds for a datetime, treating naive values as UTC (as format_datetime_for_api does)"""
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return int(dt.timestamp())
+
+
+def _from_utc_seconds(ts: int) -> datetime:
+    return datetime.fromtimestamp(ts, timezone.utc)
+
+
+# (epoch second, info) of the last get_current_datetime_info() result
+_time_info_cache = (-1, None)
+
+
 def get_current_datetime_info():
     """
     Get current date and time information.
     Returns a dict with formatted date/time strings.
     Can be used both in tools and system prompts.
+    Results are reused within the same wall-clock second, and are read-only since they're shared.
     """
-    now = datetime.now(timezone.utc)
-    return {
-        "date": now.strftime("%Y-%m-%d"),
-        "time": now.strftime("%H:%M:%S UTC"),
+    global _time_info_cache
+    second = int(time())
+    cached_second, cached_info = _time_info_cache
+    if second == cached_second:
+        return cached_info
+
+    now = datetime.fromtimestamp(second, timezone.utc)
+    year = now.year
+    info = {
+        "date": f"{year:04d}-{now.month:02d}-{now.day:02d}",
+        "time": f"{now.hour:02d}:{now.minute:02d}:{now.second:02d} UTC",
         "datetime_full": now.strftime("%A, %B %d, %Y at %I:%M %p UTC"),
         "iso": now.isoformat(),
-        "year": str(now.year),
+        "year": str(year),
     }
+    info = MappingProxyType(info)
+    _time_info_cache = (second, info)
+    return info
 
 
 @tool
@@ -81,13 +180,13 @@ def get_current_time() -> str:
     """
     try:
         time_info = get_current_datetime_info()
-        print(f"\n[TOOL] get_current_time called: {time_info['iso']}")
+        logger.debug("get_current_time called: %s", time_info['iso'])
         result = f"Current date and time: {time_info['datetime_full']}\nISO format: {time_info['iso']}"
-        print(f"[TOOL] get_current_time result: {result}")
+        logger.debug("get_current_time result: %s", result)
         return result
     except Exception as e:
         error = f"Error getting current time: {str(e)}"
-        print(f"[TOOL] get_current_time error: {error}")
+        logger.error("get_current_time error: %s", error)
         return error
 
 
@@ -110,11 +209,10 @@ def check_availability(user_id: str, start: str, end: str) -> str:
         A string describing the user's availability and any conflicting events
     """
     try:
-        print(f"\n[TOOL] check_availability called: user_id={user_id}, start={start}, end={end}")
+        logger.debug("check_availability called: user_id=%s, start=%s, end=%s", user_id, start, end)
         tokens = get_user_google_tokens(user_id)
-        print(f"[TOOL] Got tokens: access_token={tokens.get('access_token')[:20] if tokens else None}...")
         service = get_calendar_service(tokens)
-        print(f"[TOOL] Got calendar service")
+        logger.debug("Got calendar service")
 
         # Parse datetime strings (assumed to be naive/UTC)
         start_dt = datetime.fromisoformat(start)
@@ -130,35 +228,31 @@ def check_availability(user_id: str, start: str, end: str) -> str:
             timeMax=time_max,
             singleEvents=True,
             orderBy="startTime",
+            maxResults=_LIST_MAX_RESULTS,
+            fields=_LIST_FIELDS,
         ).execute()
 
         items = events.get("items", [])
-        print(f"[TOOL] Found {len(items)} events during check_availability")
+        logger.debug("Found %d events during check_availability", len(items))
 
         if not items:
             return f"✓ You are free from {start} to {end}."
 
-        busy_events = []
-        print(f"[TOOL] Processing {len(items)} events:")
-        for e in items:
-            summary = e.get('summary', 'Unnamed event')
-            start_time = e['start'].get('dateTime', e['start'].get('date', 'Unknown'))
-            end_time = e['end'].get('dateTime', e['end'].get('date', 'Unknown'))
-            print(f"[TOOL]   Event: {summary} ({start_time} → {end_time})")
-            busy_events.append(f"  • {summary} ({start_time} → {end_time})")
+        busy_events = "\n".join([
+            "  • {} ({} → {})".format(e.get('summary', 'Unnamed event'), *_event_bounds(e))
+            for e in items
+        ])
 
-        result = f"You have {len(busy_events)} conflicting event(s) during this time:\n" + "\n".join(busy_events)
-        print(f"[TOOL] check_availability result: {result}")
+        result = f"You have {len(items)} conflicting event(s) during this time:\n{busy_events}"
+        logger.debug("check_availability result: %s", result)
         return result
     except RefreshError as e:
         error = "Your Google account access has expired. Please log out and log back in to refresh your calendar permissions."
-        print(f"[TOOL] check_availability RefreshError: {error}")
+        logger.warning("check_availability RefreshError for user %s", user_id)
         return error
     except Exception as e:
         error = f"Error checking availability: {str(e)}"
-        print(f"[TOOL] check_availability error: {error}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("check_availability failed")
         return error
 
 
@@ -174,6 +268,8 @@ def find_available_slots(user_id: str, start: str, end: str, duration_minutes: i
     Returns:
         A string listing available time slots
     """
+    if duration_minutes <= 0:
+        return "Meeting duration must be a positive number of minutes."
     try:
         tokens = get_user_google_tokens(user_id)
         service = get_calendar_service(tokens)
@@ -197,32 +293,49 @@ def find_available_slots(user_id: str, start: str, end: str, duration_minutes: i
             timeMax=time_max,
             singleEvents=True,
             orderBy="startTime",
+            maxResults=_LIST_MAX_RESULTS,
+            fields=_LIST_FIELDS,
         ).execute()
 
         items = events.get("items", [])
         
-        # Find gaps between events
-        available_slots = []
-        current_time = start_dt
-
-        for event in items:
-            event_start = datetime.fromisoformat(event['start'].get('dateTime', event['start'].get('date')).replace('Z', '+00:00'))
-            event_end = datetime.fromisoformat(event['end'].get('dateTime', event['end'].get('date')).replace('Z', '+00:00'))
-
-            # Check if there's a gap before this event
-            gap = event_start - current_time
-            if gap.total_seconds() >= duration_minutes * 60:
-                slot_end = current_time + timedelta(minutes=duration_minutes)
-                available_slots.append(f"  • {current_time.isoformat()} → {slot_end.isoformat()}")
-
-            current_time = max(current_time, event_end)
-
-        # Check gap after last event
-        if current_time < end_dt:
-            gap = end_dt - current_time
-            if gap.total_seconds() >= duration_minutes * 60:
-                slot_end = current_time + timedelta(minutes=duration_minutes)
-                available_slots.append(f"  • {current_time.isoformat()} → {slot_end.isoformat()}")
+        # Busy intervals in integer UTC seconds, sorted and merged where they overlap or touch
+        needed = duration_minutes * 60
+        parse_dt = _parse_gcal_dt
+        to_seconds = _to_utc_seconds
+        busy = sorted(
+            (to_seconds(parse_dt(start_str)), to_seconds(parse_dt(end_str)))
+            for start_str, end_str in map(_event_bounds, items)
+        )
+        merged = []
+        for busy_start, busy_end in busy:
+            if merged and busy_start <= merged[-1][1]:
+                if busy_end > merged[-1][1]:
+                    merged[-1][1] = busy_end
+            else:
+                merged.append([busy_start, busy_end])
+
+        # Fill each free gap in the window with back-to-back slots
+        window_end = _to_utc_seconds(end_dt)
+        merged.append([window_end, window_end])  # Sentinel for the gap after the last event
+        slot_starts = []
+        gap_start = _to_utc_seconds(start_dt)
+        for busy_start, busy_end in merged:
+            gap_end = min(busy_start, window_end)
+            if gap_end - gap_start >= needed:
+                slot_starts.extend(range(gap_start, gap_end - needed + 1, needed))
+                if len(slot_starts) >= _MAX_SLOTS:
+                    del slot_starts[_MAX_SLOTS:]
+                    break
+            if busy_end > gap_start:
+                gap_start = busy_end
+            if gap_start >= window_end:
+                break
+
+        available_slots = [
+            f"  • {_from_utc_seconds(ts).isoformat()} → {_from_utc_seconds(ts + needed).isoformat()}"
+            for ts in slot_starts
+        ]
 
         if available_slots:
             return f"Available {duration_minutes}-minute slots:\n" + "\n".join(available_slots)
@@ -231,6 +344,7 @@ def find_available_slots(user_id: str, start: str, end: str, duration_minutes: i
     except RefreshError as e:
         return "Your Google account access has expired. Please log out and log back in to refresh your calendar permissions."
     except Exception as e:
+        logger.exception("find_available_slots failed")
         return f"Error finding available slots: {str(e)}"
 
 
@@ -273,50 +387,51 @@ def create_event(user_id: str, title: str, start: str, end: str, description: st
         A string confirming the event creation with the calendar link
     """
     try:
-        print(f"\n[TOOL] create_event called: user_id={user_id}, title={title}, start={start}, end={end}, timezone={user_timezone}")
+        logger.debug("create_event called: user_id=%s, title=%s, start=%s, end=%s, timezone=%s", user_id, title, start, end, user_timezone)
         tokens = get_user_google_tokens(user_id)
         service = get_calendar_service(tokens)
 
         # Parse datetime as naive (assumed to be in user's local timezone)
         start_dt = datetime.fromisoformat(start)
         end_dt = datetime.fromisoformat(end)
-        print(f"[TOOL] Parsed datetimes: start={start_dt}, end={end_dt}")
+        logger.debug("Parsed datetimes: start=%s, end=%s", start_dt, end_dt)
         
         # Get user timezone offset (from parameter or fallback to UTC)
-        if user_timezone is None:
-            user_timezone = "+00:00"
-        
-        # Parse timezone offset (e.g., "+05:30" or "-05:00")
-        user_tz = parse_timezone_offset(user_timezone)
-        print(f"[TOOL] Parsed timezone offset '{user_timezone}' to timezone object")
-        
-        # Localize to user's timezone (treat naive datetime as local time)
-        start_dt_local = start_dt.replace(tzinfo=user_tz)
-        end_dt_local = end_dt.replace(tzinfo=user_tz)
-        print(f"[TOOL] Localized datetimes: start={start_dt_local}, end={end_dt_local}, offset={user_timezone}")
+        if user_timezone in _UTC_OFFSETS:
+            # Already UTC - attach it directly and skip the localize/convert round-trip
+            user_tz = timezone.utc
+            start_dt_local = start_dt_utc = start_dt.replace(tzinfo=user_tz)
+            end_dt_local = end_dt_utc = end_dt.replace(tzinfo=user_tz)
+        else:
+            # Parse timezone offset (e.g., "+05:30" or "-05:00")
+            user_tz = parse_timezone_offset(user_timezone)
+            logger.debug("Parsed timezone offset '%s' to timezone object", user_timezone)
+            
+            # Localize to user's timezone (treat naive datetime as local time)
+            start_dt_local = start_dt.replace(tzinfo=user_tz)
+            end_dt_local = end_dt.replace(tzinfo=user_tz)
+            logger.debug("Localized datetimes: start=%s, end=%s, offset=%s", start_dt_local, end_dt_local, user_timezone)
+            
+            # Convert to UTC for Google Calendar API (API requires timezone name, so we use UTC)
+            start_dt_utc = start_dt_local.astimezone(timezone.utc)
+            end_dt_utc = end_dt_local.astimezone(timezone.utc)
         
         # Validate that the event is not in the past
         now_local = datetime.now(user_tz)
         if start_dt_local < now_local:
-            warning = f"WARNING: Event start time {start_dt_local} is in the past (current time: {now_local}). Event may not appear in calendar views."
-            print(f"[TOOL] {warning}")
+            logger.warning("Event start time %s is in the past (current time: %s). Event may not appear in calendar views.", start_dt_local, now_local)
             # Don't fail, but log the warning - the event will still be created
-        
-        # Convert to UTC for Google Calendar API (API requires timezone name, so we use UTC)
-        start_dt_utc = start_dt_local.astimezone(timezone.utc)
-        end_dt_utc = end_dt_local.astimezone(timezone.utc)
 
         event = {
             "summary": title,
-            "start": {"dateTime": start_dt_utc.isoformat().replace('+00:00', 'Z'), "timeZone": "UTC"},
-            "end": {"dateTime": end_dt_utc.isoformat().replace('+00:00', 'Z'), "timeZone": "UTC"},
+            "start": {"dateTime": format_datetime_for_api(start_dt_utc), "timeZone": "UTC"},
+            "end": {"dateTime": format_datetime_for_api(end_dt_utc), "timeZone": "UTC"},
         }
 
         if description:
             event["description"] = description
 
-        print(f"[TOOL] Creating event with body: {event}")
-        print(f"[TOOL] Using calendarId='primary' (user's main calendar)")
+        logger.debug("Creating event with body: %s", event)
         try:
             created = service.events().insert(
                 calendarId="primary",
@@ -324,56 +439,114 @@ def create_event(user_id: str, title: str, start: str, end: str, description: st
             ).execute()
             
             event_id = created.get('id')
-            event_link = created.get('htmlLink')
-            event_start = created.get('start', {}).get('dateTime', 'N/A')
-            event_end = created.get('end', {}).get('dateTime', 'N/A')
-            event_calendar_id = created.get('organizer', {}).get('email', 'N/A')
             event_status = created.get('status', 'N/A')
-            event_visibility = created.get('visibility', 'N/A')
-            event_attendees = created.get('attendees', [])
             
-            print(f"[TOOL] Event created successfully!")
-            print(f"[TOOL] Event ID: {event_id}")
-            print(f"[TOOL] Event Link: {event_link}")
-            print(f"[TOOL] Event Start: {event_start}")
-            print(f"[TOOL] Event End: {event_end}")
-            print(f"[TOOL] Event Calendar (organizer): {event_calendar_id}")
-            print(f"[TOOL] Event Status: {event_status}")
-            print(f"[TOOL] Event Visibility: {event_visibility}")
-            print(f"[TOOL] Event Attendees: {len(event_attendees)}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "Event created: id=%s link=%s start=%s end=%s organizer=%s status=%s visibility=%s attendees=%d",
+                    event_id,
+                    created.get('htmlLink'),
+                    created.get('start', {}).get('dateTime', 'N/A'),
+                    created.get('end', {}).get('dateTime', 'N/A'),
+                    created.get('organizer', {}).get('email', 'N/A'),
+                    event_status,
+                    created.get('visibility', 'N/A'),
+                    len(created.get('attendees', [])),
+                )
             
             # Verify the event is in the primary calendar
             if event_status != 'confirmed':
-                print(f"[TOOL] WARNING: Event status is '{event_status}', not 'confirmed'!")
+                logger.warning("Event status is '%s', not 'confirmed'", event_status)
             
             if not event_id:
-                print(f"[TOOL] WARNING: Event created but no ID returned!")
+                logger.warning("Event created but no ID returned")
                 return f"Error: Event creation may have failed - no event ID returned. Please check your Google Calendar."
         except Exception as api_error:
             error_msg = f"Google Calendar API error: {str(api_error)}"
-            print(f"[TOOL] API error during event creation: {error_msg}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Google Calendar API error during event creation")
             return f"Error creating event: {error_msg}"
 
         # Format time for user-friendly response (TTS-friendly)
-        start_time_str = start_dt.strftime("%I:%M %p").lstrip('0')
-        end_time_str = end_dt.strftime("%I:%M %p").lstrip('0')
-        date_str = start_dt.strftime("%B %d, %Y")
+        start_time_str = _format_clock(start_dt)
+        end_time_str = _format_clock(end_dt)
+        date_str = f"{_MONTHS[start_dt.month]} {start_dt.day:02d}, {start_dt.year}"
         
         return f"I've scheduled {title} for {date_str} from {start_time_str} to {end_time_str}."
     except RefreshError as e:
         error_msg = "Your Google account access has expired. Please log out and log back in to refresh your calendar permissions."
-        print(f"[TOOL] create_event RefreshError: {error_msg}")
+        logger.warning("create_event RefreshError for user %s", user_id)
         return error_msg
     except Exception as e:
         error_msg = f"Error creating event: {str(e)}"
-        print(f"[TOOL] create_event error: {error_msg}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("create_event failed")
         return error_msg
 
 
+# (monotonic second, now, now formatted for the API) of the last _query_now() result
+_query_now_cache = (-1, None, None)
+
+
+def _query_now():
+    """Current UTC time and its API string, reused within the same second"""
+    global _query_now_cache
+    second = int(monotonic())
+    cached_second, now, time_min = _query_now_cache
+    if second != cached_second:
+        now = datetime.now(timezone.utc)
+        time_min = format_datetime_for_api(now)
+        _query_now_cache = (second, now, time_min)
+    return now, time_min
+
+
+# (user_id, hours, epoch second) -> Future for the events list, shared by identical concurrent calls
+_upcoming_inflight = {}
+_upcoming_inflight_lock = threading.Lock()
+
+
+def _fetch_upcoming_items(user_id: str, hours: int) -> list:
+    """
+    Fetch the next `hours` of events for the user.
+    Identical calls made within the same second share one Calendar API request.
+    """
+    key = (user_id, hours, int(time()))
+    with _upcoming_inflight_lock:
+        pending = _upcoming_inflight.get(key)
+        if pending is None:
+            _upcoming_inflight[key] = call = Future()
+    if pending is not None:
+        return pending.result()
+
+    try:
+        tokens = get_user_google_tokens(user_id)
+        service = get_calendar_service(tokens)
+
+        now, time_min = _query_now()
+        
+        # Format for Google Calendar API
+        time_max = format_datetime_for_api(now + timedelta(hours=hours))
+        logger.debug("Query range: %s to %s", time_min, time_max)
+
+        events = service.events().list(
+            calendarId="primary",
+            timeMin=time_min,
+            timeMax=time_max,
+            singleEvents=True,
+            orderBy="startTime",
+            maxResults=_LIST_MAX_RESULTS,
+            fields=_LIST_FIELDS,
+        ).execute()
+        items = events.get("items", [])
+    except BaseException as e:
+        call.set_exception(e)
+        raise
+    else:
+        call.set_result(items)
+        return items
+    finally:
+        with _upcoming_inflight_lock:
+            _upcoming_inflight.pop(key, None)
+
+
 @tool
 def get_upcoming_events(user_id: str, hours: int = 24, user_timezone: str = None) -> str:
     """
@@ -394,32 +567,13 @@ def get_upcoming_events(user_id: str, hours: int = 24, user_timezone: str = None
         A string listing upcoming events
     """
     try:
-        print(f"\n[TOOL] get_upcoming_events called: user_id={user_id}, hours={hours}")
-        tokens = get_user_google_tokens(user_id)
-        service = get_calendar_service(tokens)
-
-        now = datetime.now(timezone.utc)
-        future = now + timedelta(hours=hours)
-        
-        # Format for Google Calendar API
-        time_min = format_datetime_for_api(now)
-        time_max = format_datetime_for_api(future)
-        print(f"[TOOL] Query range: {time_min} to {time_max}")
-
-        events = service.events().list(
-            calendarId="primary",
-            timeMin=time_min,
-            timeMax=time_max,
-            singleEvents=True,
-            orderBy="startTime",
-        ).execute()
-
-        items = events.get("items", [])
-        print(f"[TOOL] get_upcoming_events found {len(items)} events")
+        logger.debug("get_upcoming_events called: user_id=%s, hours=%s", user_id, hours)
+        items = _fetch_upcoming_items(user_id, hours)
+        logger.debug("get_upcoming_events found %d events", len(items))
 
         if not items:
             result = f"No upcoming events in the next {hours} hours."
-            print(f"[TOOL] get_upcoming_events result: {result}")
+            logger.debug("get_upcoming_events result: %s", result)
             return result
 
         # Get user timezone offset (from parameter or fallback to UTC)
@@ -429,22 +583,20 @@ def get_upcoming_events(user_id: str, hours: int = 24, user_timezone: str = None
         # Parse timezone offset (e.g., "+05:30" or "-05:00")
         user_tz = parse_timezone_offset(user_timezone)
         utc_tz = timezone.utc
+        parse_dt = _parse_gcal_dt
         upcoming = []
+        append = upcoming.append
         
         for e in items:
             summary = e.get('summary', 'Unnamed event')
-            start_time_str = e['start'].get('dateTime', e['start'].get('date', 'Unknown'))
+            e_start = e['start']
+            start_time_str = e_start.get('dateTime') or e_start.get('date', 'Unknown')
             
             # Parse and convert to user's local timezone for display
             if 'T' in start_time_str:
                 # Has time component - parse ISO format
                 try:
-                    # Handle Z suffix (UTC)
-                    if start_time_str.endswith('Z'):
-                        dt_str = start_time_str.replace('Z', '+00:00')
-                        dt = datetime.fromisoformat(dt_str)
-                    else:
-                        dt = datetime.fromisoformat(start_time_str)
+                    dt = parse_dt(start_time_str)
                     
                     # Ensure timezone-aware
                     if dt.tzinfo is None:
@@ -454,36 +606,44 @@ def get_upcoming_events(user_id: str, hours: int = 24, user_timezone: str = None
                     
                     # Convert to user's local timezone
                     dt_local = dt_utc.astimezone(user_tz)
-                    formatted_time = dt_local.strftime("%B %d at %I:%M %p").lstrip('0').replace(' 0', ' ')
-                    upcoming.append(f"{summary} on {formatted_time}")
+                    formatted_time = f"{_MONTHS[dt_local.month]} {dt_local.day} at {_format_clock(dt_local)}"
+                    append(f"{summary} on {formatted_time}")
                 except Exception as parse_error:
                     # Fallback: just use the raw string
-                    print(f"[TOOL] Error parsing datetime {start_time_str}: {parse_error}")
-                    upcoming.append(f"{summary} on {start_time_str}")
+                    logger.warning("Error parsing datetime %s: %s", start_time_str, parse_error)
+                    append(f"{summary} on {start_time_str}")
             else:
                 # Date only
                 try:
-                    dt = datetime.fromisoformat(start_time_str)
-                    formatted_date = dt.strftime("%B %d, %Y")
-                    upcoming.append(f"{summary} on {formatted_date}")
+                    dt = parse_dt(start_time_str)
+                    formatted_date = f"{_MONTHS[dt.month]} {dt.day:02d}, {dt.year}"
+                    append(f"{summary} on {formatted_date}")
                 except:
-                    upcoming.append(f"{summary} on {start_time_str}")
+                    append(f"{summary} on {start_time_str}")
             
-            print(f"[TOOL]   Event: {summary} - {start_time_str}")
+            logger.debug("  Event: %s - %s", summary, start_time_str)
 
         if upcoming:
             result = "Upcoming events:\n" + "\n".join(upcoming)
         else:
             result = f"No upcoming events in the next {hours} hours."
-        print(f"[TOOL] get_upcoming_events result:\n{result}")
+        logger.debug("get_upcoming_events result:\n%s", result)
         return result
     except RefreshError as e:
         error = "Your Google account access has expired. Please log out and log back in to refresh your calendar permissions."
-        print(f"[TOOL] get_upcoming_events RefreshError: {error}")
+        logger.warning("get_upcoming_events RefreshError for user %s", user_id)
         return error
     except Exception as e:
         error = f"Error fetching upcoming events: {str(e)}"
-        print(f"[TOOL] get_upcoming_events error: {error}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("get_upcoming_events failed")
         return error
+
+
+# Tools that only read the calendar and can safely run concurrently.
+# Anything not listed here (create_event) mutates the calendar and must run one at a time.
+READ_ONLY_TOOLS = frozenset({
+    "get_current_time",
+    "check_availability",
+    "find_available_slots",
+    "get_upcoming_events",
+})
@@ -1,18 +1,65 @@
+import logging
 from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
+from starlette.datastructures import Headers
+from starlette.responses import Response
 from app.api import health, auth, realtime
+from app.config import settings
+
+logging.basicConfig(
+    level=settings.LOG_LEVEL,
+    format="%(asctime)s %(levelname)s [%(name)s] %(message)s",
+)
+
+_ALLOW_ORIGIN_HEADER = (b"access-control-allow-origin", b"*")
+_PREFLIGHT_HEADERS = {
+    "Access-Control-Allow-Origin": "*",
+    "Access-Control-Allow-Methods": "*",
+    "Access-Control-Max-Age": "86400",  # Let browsers skip repeat preflights for a day
+}
+
+
+class AllowAllCORSMiddleware:
+    """
+    CORS for an allow-all policy (any origin, method and header, no credentials).
+    Nothing is matched per request: preflights get a fixed response and other
+    cross-origin responses just get the wildcard origin header.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        if "origin" not in headers:
+            await self.app(scope, receive, send)
+            return
+
+        if scope["method"] == "OPTIONS" and "access-control-request-method" in headers:
+            preflight_headers = dict(_PREFLIGHT_HEADERS)
+            # Echo requested headers - a "*" wildcard doesn't cover Authorization
+            requested_headers = headers.get("access-control-request-headers")
+            if requested_headers:
+                preflight_headers["Access-Control-Allow-Headers"] = requested_headers
+            await Response(status_code=204, headers=preflight_headers)(scope, receive, send)
+            return
+
+        async def send_with_cors(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", ()), _ALLOW_ORIGIN_HEADER]
+            await send(message)
+
+        await self.app(scope, receive, send_with_cors)
+
 
 app = FastAPI()
 
 # Add CORS middleware BEFORE routes
-# Allow all origins for network access
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # Allow all origins for network access
-    allow_credentials=False,  # Must be False when allow_origins is ["*"]
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+# Allow all origins for network access (no credentials, so "*" is valid)
+app.add_middleware(AllowAllCORSMiddleware)
 
 app.include_router(health.router)
 app.include_router(auth.router)
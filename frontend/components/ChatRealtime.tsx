@@ -3,6 +3,9 @@
 import { useState, useRef, useEffect } from "react";
 import { getRealtimeWebSocketUrl } from "@/constants/api";
 
+// Decodes binary JSON frames from the server
+const textDecoder = new TextDecoder();
+
 interface ChatProps {
   onLogout: () => void;
 }
@@ -48,6 +51,8 @@ export default function ChatRealtime({ onLogout }: ChatProps) {
     
     console.log("[REALTIME] Connecting to:", wsUrl);
     const ws = new WebSocket(wsUrl);
+    // Server sends JSON events as binary frames
+    ws.binaryType = "arraybuffer";
 
     ws.onopen = () => {
       console.log("[REALTIME] WebSocket connected - state:", ws.readyState, "(should be 1=OPEN)");
@@ -63,27 +68,32 @@ export default function ChatRealtime({ onLogout }: ChatProps) {
     ws.onmessage = async (event) => {
       try {
         // Try to parse as JSON first
-        if (typeof event.data === 'string') {
-          const data = JSON.parse(event.data);
+        if (typeof event.data === 'string' || event.data instanceof ArrayBuffer) {
+          const text = typeof event.data === 'string' ? event.data : textDecoder.decode(event.data);
+          const message = JSON.parse(text);
+          // Server may coalesce several events into one batch message - handle them in order
+          const events = message.type === "batch" ? message.events : [message];
           
-          // Handle connection update
-          if (data.type === "connection.update" && data.status === "connected") {
-            console.log("[REALTIME] Connection confirmed by server. WebSocket state:", wsRef.current?.readyState);
-            setIsConnected(true);
-            setError(null);
-            // If we're already listening, the audio processor will now start sending
-            if (isListeningRef.current) {
-              console.log("[REALTIME] Server confirmed connection while listening - audio will now be sent");
+          for (const data of events) {
+            // Handle connection update
+            if (data.type === "connection.update" && data.status === "connected") {
+              console.log("[REALTIME] Connection confirmed by server. WebSocket state:", wsRef.current?.readyState);
+              setIsConnected(true);
+              setError(null);
+              // If we're already listening, the audio processor will now start sending
+              if (isListeningRef.current) {
+                console.log("[REALTIME] Server confirmed connection while listening - audio will now be sent");
+              }
+              continue;
             }
-            return;
-          }
-          
-          // Log response-related events for debugging
-          if (data.type && (data.type.includes("response") || data.type.includes("output") || data.type.includes("function"))) {
-            console.log(`[REALTIME] Received ${data.type} event:`, data);
+            
+            // Log response-related events for debugging
+            if (data.type && (data.type.includes("response") || data.type.includes("output") || data.type.includes("function"))) {
+              console.log(`[REALTIME] Received ${data.type} event:`, data);
+            }
+            
+            await handleRealtimeEvent(data);
           }
-          
-          await handleRealtimeEvent(data);
         }
       } catch (e) {
         console.error("[REALTIME] Error handling message:", e);